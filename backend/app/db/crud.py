@@ -0,0 +1,75 @@
+"""
+Query functions for the users, ratings and movies tables.
+
+Each function takes the connection to run on as its first argument so it
+can be dispatched through `app.db.database.read`/`write`.
+"""
+
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+# SQL is kept in constants so every call passes the identical string and
+# hits the connection's prepared-statement cache
+SQL_INSERT_USER = "INSERT INTO users (username) VALUES (?) RETURNING id"
+SQL_SELECT_USER = "SELECT id, username FROM users WHERE id=?"
+SQL_INSERT_RATING = "INSERT INTO ratings (user_id, movie_id, rating) VALUES (?, ?, ?) RETURNING id"
+SQL_SELECT_RATINGS = "SELECT movie_id, rating FROM ratings WHERE user_id=?"
+SQL_SELECT_MOVIES = "SELECT id, title, release_date, overview FROM movies"
+SQL_IMPORT_COMPLETED = "SELECT 1 FROM imports WHERE name=?"
+SQL_MARK_IMPORT_COMPLETED = "INSERT OR IGNORE INTO imports (name) VALUES (?)"
+SQL_INSERT_MOVIE = "INSERT OR IGNORE INTO movies (id, title, release_date, overview) VALUES (?, ?, ?, ?)"
+
+
+def create_user(conn: sqlite3.Connection, username: str) -> int:
+    """
+    Insert a user and return its id.
+
+    Raises:
+        sqlite3.IntegrityError: If the username is already taken
+    """
+    row = conn.execute(SQL_INSERT_USER, (username,)).fetchone()
+    conn.commit()
+    return row["id"]
+
+
+def get_user(conn: sqlite3.Connection, user_id: int) -> Optional[Dict[str, Any]]:
+    """Return the user with the given id, or None."""
+    user = conn.execute(SQL_SELECT_USER, (user_id,)).fetchone()
+    return dict(user) if user else None
+
+
+def add_rating(conn: sqlite3.Connection, user_id: int, movie_id: int, rating: float) -> int:
+    """Insert a rating and return its id."""
+    row = conn.execute(SQL_INSERT_RATING, (user_id, movie_id, rating)).fetchone()
+    conn.commit()
+    return row["id"]
+
+
+def get_ratings(conn: sqlite3.Connection, user_id: int) -> List[Dict[str, Any]]:
+    """Return every rating made by the given user."""
+    ratings = conn.execute(SQL_SELECT_RATINGS, (user_id,)).fetchall()
+    return [dict(r) for r in ratings]
+
+
+def get_movies(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Return every stored movie."""
+    movies = conn.execute(SQL_SELECT_MOVIES).fetchall()
+    return [dict(m) for m in movies]
+
+
+def import_completed(conn: sqlite3.Connection, name: str) -> bool:
+    """Return True if the named import has finished without errors."""
+    return conn.execute(SQL_IMPORT_COMPLETED, (name,)).fetchone() is not None
+
+
+def mark_import_completed(conn: sqlite3.Connection, name: str):
+    """Record that the named import has finished without errors."""
+    with conn:
+        conn.execute(SQL_MARK_IMPORT_COMPLETED, (name,))
+
+
+def insert_movies(conn: sqlite3.Connection, movies: List[Dict[str, Any]]):
+    """Insert TMDB movie results in one transaction, skipping ones already stored."""
+    rows = [(m["id"], m["title"], m["release_date"], m["overview"]) for m in movies]
+    with conn:
+        conn.executemany(SQL_INSERT_MOVIE, rows)
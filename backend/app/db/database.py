@@ -0,0 +1,171 @@
+"""
+SQLite connection pool.
+
+Holds one dedicated write connection guarded by a lock and a queue of
+read connections. Every connection is opened in WAL mode, so readers
+run in parallel with each other and with the single writer. Async code
+runs its queries through `read`/`write`, which hop onto bounded thread
+pools so the event loop is never blocked on disk I/O. The pool lives
+between `init` and `shutdown`, which the app's lifespan calls.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from queue import Queue
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+DATABASE_PATH = "movies.db"
+POOL_SIZE = 8
+
+# WAL journal so readers don't block the writer and commits become a
+# WAL append, relaxed fsync, 64 MB page cache, in-memory temp store
+CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=268435456;
+"""
+
+
+def connect(path: str = DATABASE_PATH) -> sqlite3.Connection:
+    """
+    Open a connection with the WAL PRAGMAs applied.
+
+    Args:
+        path: Path to the SQLite database file
+
+    Returns:
+        Configured connection
+    """
+    conn = sqlite3.connect(path, check_same_thread=False)
+    # rows are addressable by column name and convert straight to dicts
+    conn.row_factory = sqlite3.Row
+    conn.executescript(CONNECTION_PRAGMAS)
+    return conn
+
+
+class ConnectionPool:
+    """
+    Pool of SQLite connections: N readers plus one locked writer.
+    """
+
+    def __init__(self, path: str = DATABASE_PATH, size: int = POOL_SIZE):
+        """
+        Open the reader and writer connections.
+
+        Args:
+            path: Path to the SQLite database file
+            size: Number of reader connections
+        """
+        self._writer = connect(path)
+        self._write_lock = threading.Lock()
+        self._readers: Queue = Queue(maxsize=size)
+        for _ in range(size):
+            self._readers.put(connect(path))
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read connection, blocking until one is free."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Hold the write connection; uncommitted work is rolled back."""
+        with self._write_lock:
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+
+    def close(self):
+        """Close every connection in the pool."""
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        self._writer.close()
+
+
+# created by `init` and torn down by `shutdown`, so importing this module
+# opens no connections
+pool: Optional[ConnectionPool] = None
+_read_executor: Optional[ThreadPoolExecutor] = None
+_write_executor: Optional[ThreadPoolExecutor] = None
+
+
+def init(path: str = DATABASE_PATH):
+    """
+    Open the connection pool and start the query executors.
+
+    Reads get one thread per reader connection; writes get a single
+    dedicated thread, so queued writes line up there instead of parking
+    reader threads on the write lock.
+
+    Args:
+        path: Path to the SQLite database file
+    """
+    global pool, _read_executor, _write_executor
+    pool = ConnectionPool(path)
+    _read_executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="sqlite-read")
+    _write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-write")
+
+
+def shutdown():
+    """Stop the query executors and close every pooled connection."""
+    global pool, _read_executor, _write_executor
+    if pool is None:
+        return
+    _read_executor.shutdown()
+    _write_executor.shutdown()
+    pool.close()
+    pool = _read_executor = _write_executor = None
+
+
+def _run(checkout: Callable, fn: Callable[..., T], args: tuple) -> T:
+    with checkout() as conn:
+        return fn(conn, *args)
+
+
+async def _dispatch(write: bool, fn: Callable[..., T], args: tuple) -> T:
+    if pool is None:
+        raise RuntimeError("Database is not initialised; call init() first")
+    executor, checkout = (_write_executor, pool.writer) if write else (_read_executor, pool.reader)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, _run, checkout, fn, args)
+
+
+async def read(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Run `fn(conn, *args)` on a read connection off the event loop.
+
+    Args:
+        fn: Query function taking a connection as its first argument
+        *args: Remaining arguments for `fn`
+
+    Returns:
+        Whatever `fn` returns
+    """
+    return await _dispatch(False, fn, args)
+
+
+async def write(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Run `fn(conn, *args)` on the write connection off the event loop.
+
+    Args:
+        fn: Query function taking a connection as its first argument
+        *args: Remaining arguments for `fn`
+
+    Returns:
+        Whatever `fn` returns
+    """
+    return await _dispatch(True, fn, args)
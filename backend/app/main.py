@@ -1,48 +1,60 @@
-from fastapi import FastAPI, HTTPException
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
+import asyncio
+import hashlib
+import logging
 import sqlite3
-from app.movies.tmdb_client import make_tmdb_request
-import pprint
-import json
+from app.db import crud, database
+from app.db.database import read, write
+from app.movies.tmdb_client import close_default_client, make_tmdb_request
+import orjson
 
-app = FastAPI()
-
-# connect to SQLite 
-conn = sqlite3.connect("movies.db", check_same_thread=False)
-cursor = conn.cursor()
+logger = logging.getLogger(__name__)
 
 # create Tables
-# user table
-cursor.execute("""
+SCHEMA_SQL = """
+-- user table
 CREATE TABLE IF NOT EXISTS users (
     id INTEGER PRIMARY KEY AUTOINCREMENT, 
     username TEXT UNIQUE
-)
-""")
+);
 
-# ratings table
-cursor.execute("""
+-- ratings table
 CREATE TABLE IF NOT EXISTS ratings (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     user_id INTEGER,
     movie_id INTEGER,
     rating REAL,
     FOREIGN KEY (user_id) REFERENCES users(id)
-)
-""")
+);
 
-# movies table
-cursor.execute("""
+-- movies table
 CREATE TABLE IF NOT EXISTS movies (
     id INTEGER PRIMARY KEY,
     title TEXT,
     release_date TEXT,
     overview TEXT
-)
-""")
+);
+
+-- covering index for ratings by user: served from the index alone
+CREATE INDEX IF NOT EXISTS idx_ratings_user_covering
+ON ratings (user_id, movie_id, rating);
+
+-- data imports that finished without errors
+CREATE TABLE IF NOT EXISTS imports (
+    name TEXT PRIMARY KEY
+);
+"""
+
+
+def create_schema(conn: sqlite3.Connection):
+    # one script, one round-trip; every statement is a no-op once the schema exists
+    conn.executescript(SCHEMA_SQL)
 
-# commit changes to database
-conn.commit()
 
 # Pydantic models
 class User(BaseModel):
@@ -54,83 +66,150 @@ class Rating(BaseModel):
     rating: float
 
 
-url = "/movie/now_playing?language=en-US&page=1"
+NOW_PLAYING_IMPORT = "tmdb_now_playing"
+NOW_PLAYING_PAGES = 10
+# concurrent TMDB requests, keeps the import under TMDB's rate limit
+TMDB_CONCURRENCY = 4
 
-response = make_tmdb_request(url)
-data = response.json()
+CACHE_TTL = 60
 
+# serialized JSON bodies and their ETags for read-heavy endpoints; users
+# are never updated, movies only change when the TMDB import runs
+movies_cache = TTLCache(maxsize=1, ttl=CACHE_TTL)
+users_cache = TTLCache(maxsize=1024, ttl=CACHE_TTL)
+
+
+def to_cached(content):
+    body = orjson.dumps(content)
+    # weak tag: GZipMiddleware may send the same body gzip- or
+    # identity-encoded, and a strong tag would have to differ between them
+    etag = 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    return body, etag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
 
-for movie in data['results']:
-    cursor.execute(
-        "INSERT OR IGNORE INTO movies (id, title, release_date, overview) VALUES (?, ?, ?, ?)", 
-        (movie["id"], movie["title"], movie["release_date"], movie["overview"])
-    )
 
-conn.commit()  # Commit all inserts at once
+def cached_response(request: Request, cached) -> Response:
+    # clients and proxies may reuse the body for CACHE_TTL seconds, then
+    # revalidate with If-None-Match and get a 304 if nothing changed
+    body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CACHE_TTL}"}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def fetch_now_playing():
+    # pages are requested concurrently over the client's HTTP/2 connection
+    sem = asyncio.Semaphore(TMDB_CONCURRENCY)
+
+    async def fetch(page):
+        async with sem:
+            response = await make_tmdb_request(
+                "/movie/now_playing", params={"language": "en-US", "page": page}
+            )
+        response.raise_for_status()
+        return response.json()['results']
+
+    # a failed page (rate limit, 5xx, ...) is skipped rather than aborting
+    # startup; the import is then reported incomplete so the next boot
+    # fetches again
+    pages = await asyncio.gather(
+        *[fetch(page) for page in range(1, NOW_PLAYING_PAGES + 1)], return_exceptions=True
+    )
+    errors = [results for results in pages if isinstance(results, Exception)]
+    if len(errors) == len(pages):
+        raise RuntimeError("Failed to fetch any now_playing page") from errors[0]
+
+    movies = []
+    for page, results in enumerate(pages, start=1):
+        if isinstance(results, Exception):
+            logger.warning("Failed to fetch now_playing page %d: %r", page, results)
+            continue
+        movies.extend(results)
+    return movies, not errors
+
+
+async def store_movies(movies):
+    await write(crud.insert_movies, movies)
+    # the cached /movies/ body no longer matches the table
+    movies_cache.clear()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.init()
+    # cached bodies belong to the previous database, if any
+    movies_cache.clear()
+    users_cache.clear()
+    try:
+        await write(create_schema)
+        # populate movies from TMDB until one import completes, so restarts
+        # and reloads after that don't hit the network
+        if not await read(crud.import_completed, NOW_PLAYING_IMPORT):
+            movies, complete = await fetch_now_playing()
+            await store_movies(movies)
+            if complete:
+                await write(crud.mark_import_completed, NOW_PLAYING_IMPORT)
+        yield
+    finally:
+        await close_default_client()
+        database.shutdown()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+# movie overviews are prose and compress well; small bodies aren't worth it
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # API endpoints
 @app.post("/users/")
-def create_user(user: User):
+async def create_user(user: User):
     try:
-        cursor.execute("INSERT INTO users (username) VALUES (?)", (user.username,))
-        conn.commit()
+        user_id = await write(crud.create_user, user.username)
         return {
             "message": "User created successfully", 
-            "id": cursor.lastrowid,
+            "id": user_id,
             "username": user.username
         }
     except sqlite3.IntegrityError:
         raise HTTPException(status_code=400, detail="Username already exists")
 
 @app.get("/users/{user_id}")
-def get_user(user_id: int):
-    cursor.execute("SELECT * FROM users WHERE id=?", (user_id,))
-    user = cursor.fetchone()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return {
-        "id": user[0], 
-        "username": user[1]
-    }
+async def get_user(user_id: int, request: Request):
+    cached = users_cache.get(user_id)
+    if cached is None:
+        user = await read(crud.get_user, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        cached = users_cache[user_id] = to_cached(user)
+    return cached_response(request, cached)
 
 @app.post("/ratings")
-def add_rating(rating: Rating):
-    cursor.execute(
-        "INSERT INTO ratings (user_id, movie_id, rating) VALUES (?, ?, ?)",
-        (rating.user_id, rating.movie_id, rating.rating)
-    )
-    conn.commit()
+async def add_rating(rating: Rating):
+    rating_id = await write(crud.add_rating, rating.user_id, rating.movie_id, rating.rating)
     return {
         "message": "Rating added successfully", 
         "status":"success", 
-        "rating_id": cursor.lastrowid
+        "rating_id": rating_id
     }
 
 @app.get("/ratings/{user_id}")
-def get_ratings(user_id: int):
-    cursor.execute("SELECT movie_id, rating FROM ratings WHERE user_id=?", (user_id,))
-    ratings = cursor.fetchall()
+async def get_ratings(user_id: int):
+    ratings = await read(crud.get_ratings, user_id)
     if not ratings:
         raise HTTPException(status_code=404, detail="No ratings found for this user")
     return {
         "user_id": user_id, 
-        "ratings": [{
-            "movie_id": r[0], 
-            "rating": r[1]
-            } for r in ratings]
+        "ratings": ratings
     }
 
 @app.get("/movies/")
-def get_movies():
-    cursor.execute("SELECT id, title, release_date, overview FROM movies")
-    movies = cursor.fetchall()
-    return [{
-        "id": m[0],
-        "title": m[1],
-        "release_date": m[2],
-        "overview": m[3]
-    } for m in movies]
-
-movies = get_movies()
-
-print(json.dumps(movies, indent=2))
\ No newline at end of file
+async def get_movies(request: Request):
+    cached = movies_cache.get("movies")
+    if cached is None:
+        cached = movies_cache["movies"] = to_cached(await read(crud.get_movies))
+    return cached_response(request, cached)
@@ -1,31 +1,40 @@
 """
 TMDB API Client with Netskope SSL certificate support.
 
-This module provides a configured requests session that handles
+This module provides a configured httpx async client that handles
 SSL certificate verification for environments using Netskope SSL inspection.
 """
 
 import os
+import ssl
 import certifi
-import requests
+import httpx
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Get the certifi bundle path (contains Netskope certificates); it doesn't
+# change at runtime, so look it up once rather than per client
+_CERT_BUNDLE = certifi.where()
+# SSL context built from that bundle, shared by every client
+_SSL_CONTEXT = ssl.create_default_context(cafile=_CERT_BUNDLE)
+
 class TMDBClient:
     """
-    HTTP client for TMDB API with proper SSL certificate configuration.
-    
-    This client automatically handles the Netskope certificate setup by:
-    1. Unsetting REQUESTS_CA_BUNDLE environment variable
-    2. Using the certifi bundle (which includes Netskope certificates)
+    Async HTTP client for TMDB API with proper SSL certificate configuration.
+
+    TLS is verified against the module's shared SSL context, built once at
+    import from the certifi bundle (which includes Netskope certificates).
+
+    Requests go over HTTP/2, so concurrent calls are multiplexed on a
+    single TLS connection.
     """
-    
+
     def __init__(self):
         """
         Initialize the TMDB client.
-        
+
         Args:
             api_key: TMDB API key (Bearer token)
         """
@@ -34,144 +43,146 @@ class TMDBClient:
             raise RuntimeError("TMDB_API_KEY not found in .env")
         self.base_url = "https://api.themoviedb.org/3"
 
-        
-        # Unset REQUESTS_CA_BUNDLE to use certifi bundle instead
-        # The certifi bundle has been replaced with the Netskope combined bundle
-        if "REQUESTS_CA_BUNDLE" in os.environ:
-            del os.environ["REQUESTS_CA_BUNDLE"]
-        
-        # Get the certifi bundle path (contains Netskope certificates)
-        self.cert_bundle = certifi.where()
-        
-        # Create a session with default headers
-        self.session = requests.Session()
-        self.session.headers.update({
-            "accept": "application/json",
-            "Authorization": f"Bearer {self.api_key}",
-        })
-        # Set the certificate bundle for all requests
-        self.session.verify = self.cert_bundle
-    
-    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        # Create a client with default headers and the shared SSL context
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "accept": "application/json",
+                "Authorization": f"Bearer {self.api_key}",
+            },
+            verify=_SSL_CONTEXT,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
         """
         Make a GET request to the TMDB API.
-        
+
         Args:
             endpoint: API endpoint (e.g., "/movie/550" or "movie/550")
             params: Optional query parameters
-            
+
         Returns:
             Response object
-            
+
         Example:
-            >>> client = TMDBClient(api_key="your_key")
-            >>> response = client.get("/movie/550")
+            >>> client = TMDBClient()
+            >>> response = await client.get("/movie/550")
             >>> data = response.json()
         """
-        url = self._build_url(endpoint)
-        return self.session.get(url, params=params)
-    
-    def post(self, endpoint: str, json: Optional[Dict[str, Any]] = None, 
-             data: Optional[Dict[str, Any]] = None) -> requests.Response:
+        return await self.client.get(endpoint, params=params)
+
+    async def post(self, endpoint: str, json: Optional[Dict[str, Any]] = None,
+                   data: Optional[Dict[str, Any]] = None) -> httpx.Response:
         """
         Make a POST request to the TMDB API.
-        
+
         Args:
             endpoint: API endpoint
             json: Optional JSON data to send
             data: Optional form data to send
-            
+
         Returns:
             Response object
         """
-        url = self._build_url(endpoint)
-        return self.session.post(url, json=json, data=data)
-    
-    def put(self, endpoint: str, json: Optional[Dict[str, Any]] = None) -> requests.Response:
+        return await self.client.post(endpoint, json=json, data=data)
+
+    async def put(self, endpoint: str, json: Optional[Dict[str, Any]] = None) -> httpx.Response:
         """
         Make a PUT request to the TMDB API.
-        
+
         Args:
             endpoint: API endpoint
             json: Optional JSON data to send
-            
+
         Returns:
             Response object
         """
-        url = self._build_url(endpoint)
-        return self.session.put(url, json=json)
-    
-    def delete(self, endpoint: str) -> requests.Response:
+        return await self.client.put(endpoint, json=json)
+
+    async def delete(self, endpoint: str) -> httpx.Response:
         """
         Make a DELETE request to the TMDB API.
-        
+
         Args:
             endpoint: API endpoint
-            
+
         Returns:
             Response object
         """
-        url = self._build_url(endpoint)
-        return self.session.delete(url)
-    
-    def _build_url(self, endpoint: str) -> str:
-        """
-        Build the full URL from an endpoint.
-        
-        Args:
-            endpoint: API endpoint (with or without leading slash)
-            
-        Returns:
-            Full URL
-        """
-        # Remove leading slash if present
-        endpoint = endpoint.lstrip('/')
-        return f"{self.base_url}/{endpoint}"
-    
-    def close(self):
-        """Close the session."""
-        self.session.close()
-    
-    def __enter__(self):
-        """Context manager entry."""
+        return await self.client.delete(endpoint)
+
+    async def close(self):
+        """Close the client and its connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
         return self
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        self.close()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+
+# Shared client, created on first use so importing this module doesn't
+# require TMDB_API_KEY
+_default_client: Optional[TMDBClient] = None
+
+
+def get_default_client() -> TMDBClient:
+    """
+    Return the shared TMDB client, creating it on first call.
+
+    Returns:
+        TMDBClient whose connection is reused across requests
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = TMDBClient()
+    return _default_client
+
+
+async def close_default_client():
+    """Close the shared TMDB client, if one was created."""
+    global _default_client
+    if _default_client is not None:
+        await _default_client.close()
+        _default_client = None
 
 
 # Convenience function for one-off requests
-def make_tmdb_request(
+async def make_tmdb_request(
     endpoint: str,
     method: str = "GET",
     **kwargs
-) -> requests.Response:
+) -> httpx.Response:
     """
-    Make a one-off request to the TMDB API with proper SSL configuration.
-    
+    Make a request to the TMDB API through the shared client.
+
     Args:
         endpoint: API endpoint
 
         method: HTTP method (GET, POST, PUT, DELETE)
-        **kwargs: Additional arguments to pass to requests
-        
+        **kwargs: Additional arguments to pass to httpx
+
     Returns:
         Response object
-        
+
     Example:
-        >>> response = make_tmdb_request("/movie/550", api_key="your_key")
+        >>> response = await make_tmdb_request("/movie/550")
         >>> data = response.json()
     """
-    with TMDBClient() as client:
-        method = method.upper()
-        if method == "GET":
-            return client.get(endpoint, params=kwargs.get('params'))
-        elif method == "POST":
-            return client.post(endpoint, json=kwargs.get('json'), data=kwargs.get('data'))
-        elif method == "PUT":
-            return client.put(endpoint, json=kwargs.get('json'))
-        elif method == "DELETE":
-            return client.delete(endpoint)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+    client = get_default_client()
+    method = method.upper()
+    if method == "GET":
+        return await client.get(endpoint, params=kwargs.get('params'))
+    elif method == "POST":
+        return await client.post(endpoint, json=kwargs.get('json'), data=kwargs.get('data'))
+    elif method == "PUT":
+        return await client.put(endpoint, json=kwargs.get('json'))
+    elif method == "DELETE":
+        return await client.delete(endpoint)
+    else:
+        raise ValueError(f"Unsupported HTTP method: {method}")
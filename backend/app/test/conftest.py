@@ -0,0 +1,48 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+MOVIES = [
+    {"id": i, "title": f"Movie {i}", "release_date": "2024-01-01", "overview": "An overview. " * 40}
+    for i in range(1, 21)
+]
+PER_PAGE = len(MOVIES) // main.NOW_PLAYING_PAGES
+
+
+class FakeTMDB:
+    """Serves MOVIES across the now_playing pages; listed pages return 429."""
+
+    def __init__(self):
+        self.failing_pages = set()
+        self.requests = 0
+
+    async def request(self, endpoint, method="GET", **kwargs):
+        self.requests += 1
+        page = kwargs["params"]["page"]
+        request = httpx.Request(method, f"https://api.themoviedb.org/3{endpoint}")
+        if page in self.failing_pages:
+            return httpx.Response(429, request=request)
+        results = MOVIES[(page - 1) * PER_PAGE:page * PER_PAGE]
+        return httpx.Response(200, json={"page": page, "results": results}, request=request)
+
+
+@pytest.fixture
+def movies():
+    return MOVIES
+
+
+@pytest.fixture
+def tmdb(tmp_path, monkeypatch):
+    # fresh movies.db per test, outside the working tree, and TMDB off the network
+    monkeypatch.chdir(tmp_path)
+    fake = FakeTMDB()
+    monkeypatch.setattr(main, "make_tmdb_request", fake.request)
+    return fake
+
+
+@pytest.fixture
+def client(tmdb):
+    with TestClient(main.app) as client:
+        yield client
@@ -0,0 +1,51 @@
+import sqlite3
+
+from app.db.database import DATABASE_PATH
+
+
+def test_create_user(client):
+    response = client.post("/users/", json={"username": "alice"})
+    assert response.status_code == 200
+    assert response.json() == {"message": "User created successfully", "id": 1, "username": "alice"}
+
+    response = client.post("/users/", json={"username": "bob"})
+    assert response.status_code == 200
+    assert response.json()["id"] == 2
+
+
+def test_create_user_duplicate_username(client):
+    assert client.post("/users/", json={"username": "alice"}).status_code == 200
+
+    response = client.post("/users/", json={"username": "alice"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Username already exists"}
+
+
+def test_get_user(client):
+    user_id = client.post("/users/", json={"username": "alice"}).json()["id"]
+
+    response = client.get(f"/users/{user_id}")
+    assert response.status_code == 200
+    assert response.json() == {"id": user_id, "username": "alice"}
+    assert response.headers["etag"].startswith('W/"')
+
+
+def test_get_user_not_found(client):
+    assert client.get("/users/999").status_code == 404
+
+
+def test_get_user_served_from_cache(client):
+    user_id = client.post("/users/", json={"username": "alice"}).json()["id"]
+    etag = client.get(f"/users/{user_id}").headers["etag"]
+
+    # change the row behind the cache; hits keep returning the cached body
+    with sqlite3.connect(DATABASE_PATH) as conn:
+        conn.execute("UPDATE users SET username='renamed' WHERE id=?", (user_id,))
+
+    response = client.get(f"/users/{user_id}")
+    assert response.json() == {"id": user_id, "username": "alice"}
+    assert response.headers["etag"] == etag
+
+    response = client.get(f"/users/{user_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+def test_get_movies(client, movies):
+    response = client.get("/movies/")
+    assert response.status_code == 200
+    assert response.json() == movies
+    assert response.headers["cache-control"] == "public, max-age=60"
+    assert response.headers["etag"].startswith('W/"')
+
+
+def test_get_movies_not_modified(client, movies):
+    etag = client.get("/movies/").headers["etag"]
+    strong = etag.removeprefix("W/")
+
+    for if_none_match in (etag, strong, f'"other", {etag}', "*"):
+        response = client.get("/movies/", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    response = client.get("/movies/", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+    assert response.json() == movies
+
+
+def test_import_retried_after_failed_page(tmdb, movies):
+    tmdb.failing_pages = {7}
+    with TestClient(main.app) as client:
+        stored = client.get("/movies/").json()
+    assert len(stored) == len(movies) - len(movies) // main.NOW_PLAYING_PAGES
+
+    # the incomplete import runs again on the next boot and fills the gap
+    tmdb.failing_pages = set()
+    with TestClient(main.app) as client:
+        assert client.get("/movies/").json() == movies
+
+    # once complete, later boots don't fetch at all
+    requests = tmdb.requests
+    with TestClient(main.app):
+        pass
+    assert tmdb.requests == requests
+
+
+def test_startup_fails_when_every_page_fails(tmdb):
+    tmdb.failing_pages = set(range(1, main.NOW_PLAYING_PAGES + 1))
+    with pytest.raises(RuntimeError, match="now_playing"):
+        with TestClient(main.app):
+            pass
+
+
+def test_store_movies_invalidates_cache(client, movies):
+    etag = client.get("/movies/").headers["etag"]
+
+    new_movie = {"id": 999, "title": "New", "release_date": "2024-02-01", "overview": "New."}
+    client.portal.call(main.store_movies, [new_movie])
+
+    response = client.get("/movies/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == movies + [new_movie]
+    assert response.headers["etag"] != etag
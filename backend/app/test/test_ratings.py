@@ -0,0 +1,30 @@
+def test_add_rating(client):
+    user_id = client.post("/users/", json={"username": "alice"}).json()["id"]
+
+    response = client.post("/ratings", json={"user_id": user_id, "movie_id": 1, "rating": 4.5})
+    assert response.status_code == 200
+    assert response.json() == {"message": "Rating added successfully", "status": "success", "rating_id": 1}
+
+    response = client.post("/ratings", json={"user_id": user_id, "movie_id": 2, "rating": 3.0})
+    assert response.json()["rating_id"] == 2
+
+
+def test_get_ratings(client):
+    alice = client.post("/users/", json={"username": "alice"}).json()["id"]
+    bob = client.post("/users/", json={"username": "bob"}).json()["id"]
+    client.post("/ratings", json={"user_id": alice, "movie_id": 1, "rating": 4.5})
+    client.post("/ratings", json={"user_id": alice, "movie_id": 2, "rating": 3.0})
+    client.post("/ratings", json={"user_id": bob, "movie_id": 1, "rating": 1.0})
+
+    response = client.get(f"/ratings/{alice}")
+    assert response.status_code == 200
+    assert response.json() == {
+        "user_id": alice,
+        "ratings": [{"movie_id": 1, "rating": 4.5}, {"movie_id": 2, "rating": 3.0}],
+    }
+
+
+def test_get_ratings_not_found(client):
+    response = client.get("/ratings/999")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "No ratings found for this user"}
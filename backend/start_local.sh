@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+# Run the API locally. app.main:app is the single ASGI entry point.
+set -e
+cd "$(dirname "$0")"
+exec uvicorn app.main:app --reload --port 8000